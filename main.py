@@ -1,5 +1,6 @@
 import os
 import time
+import fcntl
 import aiohttp
 import asyncio
 from bs4 import BeautifulSoup
@@ -24,6 +25,19 @@ utc = ZoneInfo("UTC")
 
 import json
 
+SEARCH_URL = "https://www.transfermarkt.com/schnellsuche/ergebnis/schnellsuche?query={}"
+SEARCH_INDEX_PATH = "data/search_index.json"
+SEARCH_INDEX_TTL = 30 * 24 * 3600  # entries older than this are dropped
+SEARCH_INDEX_REVALIDATE = 24 * 3600  # entries older than this are refreshed in background
+SEARCH_INDEX_MAX_ENTRIES = 5000  # oldest entries are evicted beyond this
+
+_search_index: Dict | None = None
+_search_index_mtime: float | None = None
+_search_index_persisted: Dict = {}
+_revalidating: set = set()
+_background_tasks: set = set()
+
+
 async def make_soup(url, timeout=90):
     headers = {
         "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/47.0.2526.106 Safari/537.36"
@@ -303,9 +317,14 @@ def process_players(tbl_trs: List, header_col_pos: Dict, db: pd.DataFrame):
 
 
 async def search_player(player: str, db: pd.DataFrame):
-    url = f"https://www.transfermarkt.com/schnellsuche/ergebnis/schnellsuche?query={player}"
+    url = SEARCH_URL.format(player)
 
     pageSoup = await make_soup(url)
+    try:
+        run_in_background(store_search_entries(player, parse_search_entries(pageSoup)))
+    except Exception as e:
+        logger.warning(f"Failed to index {url},Error Occurerd: {str(e)}")
+
     result_tbls = pageSoup.select("div:has(>h2.content-box-headline)")
     results = {}
 
@@ -402,79 +421,255 @@ async def process_for_upcoming_match_new_by_id(name: str, img_url: str, id: str,
     }
 
 
-async def upcoming_matches(query: str, findBy: str):
-    if findBy not in ["clubs", "players"]:
-        return []
+def normalize_query(query: str):
+    return " ".join(unicodedata.normalize("NFKC", query).casefold().split())
+
+
+def is_search_record(record):
+    return (
+        isinstance(record, dict)
+        and isinstance(record.get("updated"), (int, float))
+        and isinstance(record.get("entries"), list)
+        and all(
+            isinstance(entry, dict)
+            and {"name", "id", "image", "kind"} <= entry.keys()
+            for entry in record["entries"]
+        )
+    )
 
-    url = f"https://www.transfermarkt.com/schnellsuche/ergebnis/schnellsuche?query={query}"
 
+def load_search_index():
     try:
-        pageSoup = await make_soup(url)
+        with open(SEARCH_INDEX_PATH) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+    if not isinstance(index, dict):
+        logger.warning(f"Ignoring {SEARCH_INDEX_PATH},Error Occurerd: not a mapping")
+        return {}
+
+    return {key: record for key, record in index.items() if is_search_record(record)}
+
+
+def read_search_index():
+    try:
+        mtime = os.stat(SEARCH_INDEX_PATH).st_mtime
+    except OSError:
+        mtime = None
+
+    return mtime, prune_search_index(load_search_index())
+
+
+def prune_search_index(index: Dict):
+    now = time.time()
+    fresh = sorted(
+        (
+            (key, record)
+            for key, record in index.items()
+            if now - record["updated"] < SEARCH_INDEX_TTL
+        ),
+        key=lambda item: item[1]["updated"],
+        reverse=True,
+    )
+
+    return dict(fresh[:SEARCH_INDEX_MAX_ENTRIES])
+
+
+def merge_search_index(index: Dict, other: Dict):
+    merged = dict(index)
+    for key, record in other.items():
+        if key not in merged or merged[key]["updated"] < record["updated"]:
+            merged[key] = record
+
+    return prune_search_index(merged)
+
+
+def set_search_index(index: Dict, persisted: Dict, mtime):
+    # persisted holds what the file has, so later merges keep newer in-memory times
+    global _search_index, _search_index_mtime
+    _search_index = merge_search_index(index, _search_index or {})
+    _search_index_mtime = mtime
+    _search_index_persisted.update(
+        {key: record["updated"] for key, record in persisted.items()}
+    )
+    for key in _search_index_persisted.keys() - _search_index.keys():
+        del _search_index_persisted[key]
+
+
+async def get_search_index():
+    if _search_index is None:
+        mtime, index = await asyncio.to_thread(read_search_index)
+        set_search_index(index, index, mtime)
+
+    return _search_index
+
+
+async def reload_search_index():
+    # another worker may have saved since we last read the file
+    try:
+        mtime = (await asyncio.to_thread(os.stat, SEARCH_INDEX_PATH)).st_mtime
+    except OSError:
+        return
+    if mtime == _search_index_mtime:
+        return
+
+    mtime, index = await asyncio.to_thread(read_search_index)
+    set_search_index(index, index, mtime)
+
+
+def save_search_index(index: Dict):
+    # other workers share the file, so merge with it under an exclusive lock
+    os.makedirs(os.path.dirname(SEARCH_INDEX_PATH), exist_ok=True)
+    with open(f"{SEARCH_INDEX_PATH}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        index = merge_search_index(index, load_search_index())
+
+        tmp_path = f"{SEARCH_INDEX_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, SEARCH_INDEX_PATH)
+
+        mtime = os.stat(SEARCH_INDEX_PATH).st_mtime
+
+    return mtime, index
+
+
+async def store_search_entries(query: str, entries: List[Dict]):
+    if not entries:
+        return
+
+    try:
+        key = normalize_query(query)
+        index = await get_search_index()
+        record = index.get(key)
+        now = time.time()
+        if record is not None and record["entries"] == entries:
+            record["updated"] = now
+            # unchanged entries only need the new time on disk once per revalidation period
+            if now - _search_index_persisted.get(key, 0) < SEARCH_INDEX_REVALIDATE:
+                return
+        else:
+            index[key] = {"updated": now, "entries": entries}
+
+        mtime, saved = await asyncio.to_thread(save_search_index, dict(index))
+        set_search_index(saved, saved, mtime)
     except Exception as e:
-        logger.warning(f"Failed to fetch {url},Error Occurerd: {str(e)}")
+        logger.warning(f"Failed to save {SEARCH_INDEX_PATH},Error Occurerd: {str(e)}")
 
-    result_tbls = pageSoup.select("div:has(>h2.content-box-headline)")
-    tasks = []
 
-    for result_tbl in result_tbls:
-        if (
-            findBy
-            not in get_text(result_tbl.select("h2.content-box-headline")[0]).lower()
-        ):
+def parse_search_entries(pageSoup):
+    entries = []
+    for result_tbl in pageSoup.select("div:has(>h2.content-box-headline)"):
+        headline = get_text(result_tbl.select("h2.content-box-headline")[0]).lower()
+        kind = next((k for k in ["clubs", "players"] if k in headline), None)
+        if not kind:
             continue
 
         tbl_trs = result_tbl.select("div.responsive-table>div>table>tbody>tr")
 
         for tr in tbl_trs:
-            player = tr.find("td", {"class": "hauptlink"}).select_one("a")
+            image_url = ""
+            image = tr.find("td", {"class": "zentriert suche-vereinswappen"})
+            img = image.select_one("img") if image else None
+            if img:
+                image_url = get_image(img) or ""
+
+            hauptlink = tr.find("td", {"class": "hauptlink"})
+            player = hauptlink.select_one("a") if hauptlink else None
+            href = get_href(player) if player else None
+
+            if href:
+                entries.append(
+                    {
+                        "name": get_text(player),
+                        "id": href.split("/")[-1],
+                        "image": image_url,
+                        "kind": kind,
+                    }
+                )
 
-            if player:
-                name = get_text(player)
-                player_id = get_href(player).split("/")[-1]
-                tasks.append(process_for_upcoming_match_by_id(name, player_id, findBy == "clubs"))
+    return entries
 
-    return await asyncio.gather(*tasks)
 
+def run_in_background(coro):
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
 
-async def upcoming_matches_new(query: str, findBy: str):
-    if findBy not in ["clubs", "players"]:
-        return []
 
-    url = f"https://www.transfermarkt.com/schnellsuche/ergebnis/schnellsuche?query={query}"
+async def fetch_search_entries(query: str):
+    url = SEARCH_URL.format(query)
 
     try:
         pageSoup = await make_soup(url)
     except Exception as e:
         logger.warning(f"Failed to fetch {url},Error Occurerd: {str(e)}")
+        return []
 
-    result_tbls = pageSoup.select("div:has(>h2.content-box-headline)")
-    tasks = []
+    entries = parse_search_entries(pageSoup)
+    await store_search_entries(query, entries)
 
-    for result_tbl in result_tbls:
-        if (
-            findBy
-            not in get_text(result_tbl.select("h2.content-box-headline")[0]).lower()
-        ):
+    return entries
+
+
+async def revalidate_search_entries(query: str):
+    key = normalize_query(query)
+    try:
+        await fetch_search_entries(query)
+    except Exception as e:
+        logger.warning(f"Failed to revalidate {query},Error Occurerd: {str(e)}")
+    finally:
+        _revalidating.discard(key)
+
+
+def is_search_record_fresh(record):
+    return record is not None and time.time() - record["updated"] < SEARCH_INDEX_TTL
+
+
+async def resolve_search_entries(query: str):
+    key = normalize_query(query)
+    record = (await get_search_index()).get(key)
+    if not is_search_record_fresh(record):
+        await reload_search_index()
+        record = _search_index.get(key)
+    if not is_search_record_fresh(record):
+        return await fetch_search_entries(query)
+
+    if time.time() - record["updated"] >= SEARCH_INDEX_REVALIDATE and key not in _revalidating:
+        _revalidating.add(key)
+        run_in_background(revalidate_search_entries(query))
+
+    return record["entries"]
+
+
+async def upcoming_matches(query: str, findBy: str):
+    if findBy not in ["clubs", "players"]:
+        return []
+
+    tasks = [
+        process_for_upcoming_match_by_id(entry["name"], entry["id"], findBy == "clubs")
+        for entry in await resolve_search_entries(query)
+        if entry["kind"] == findBy
+    ]
+
+    return await asyncio.gather(*tasks)
+
+
+async def upcoming_matches_new(query: str, findBy: str):
+    if findBy not in ["clubs", "players"]:
+        return []
+
+    tasks = []
+    for entry in await resolve_search_entries(query):
+        if entry["kind"] != findBy:
             continue
 
-        tbl_trs = result_tbl.select("div.responsive-table>div>table>tbody>tr")
+        name = entry["name"]
+        if findBy == "players" and query.upper() not in name.upper():
+            continue
 
-        for tr in tbl_trs:
-            image_url = ""
-            image = tr.find("td", {"class": "zentriert suche-vereinswappen"})
-            if image:
-                image_url = get_image(image.select_one("img"))
-
-            player = tr.find("td", {"class": "hauptlink"}).select_one("a")
-
-            if player:
-                name = get_text(player)
-                player_id = get_href(player).split("/")[-1]
-                if findBy == "players" and query.upper() in name.upper():
-                    tasks.append(process_for_upcoming_match_new_by_id(name, image_url, player_id, findBy == "clubs"))
-                
-                if findBy == "clubs":
-                    tasks.append(process_for_upcoming_match_new_by_id(name, image_url, player_id, findBy == "clubs"))
+        tasks.append(process_for_upcoming_match_new_by_id(name, entry["image"], entry["id"], findBy == "clubs"))
 
     return await asyncio.gather(*tasks)
 